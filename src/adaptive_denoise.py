@@ -1,29 +1,60 @@
-from wavelet_utils import wavelet_decompose, wavelet_reconstruct
-from adaptive_threshold import adaptive_threshold
+from wavelet_utils import batched_wavedec, batched_waverec, map_channels, resolve_n_jobs
+from adaptive_threshold import adaptive_threshold, level_statistics, spatial_adaptive_threshold
 from threshold_rules import hard_threshold
 import numpy as np
+from functools import partial
 
 
-def adaptive_wavelet_denoise(signal, wavelet="db4", level=5):
-    # Perform wavelet decomposition on the input signal up to the specified level
-    coeffs_all = wavelet_decompose(signal, wavelet, level)
-    # Initialize a list to store denoised coefficients for each channel
-    denoised_coeffs = []
+# Samples per channel block (about 8 MB of float64): bounds the coefficient and
+# median temporaries of a block (one np.median over a long level block is
+# slower than per-channel calls), while short recordings still go through in
+# a single batched pass
+BLOCK_ELEMENTS = 2 ** 20
 
-    # Iterate over each channel's coefficients
-    for ch_idx, coeffs in enumerate(coeffs_all):
-        # Calculate the energy of the current channel (mean of squared signal values)
-        channel_energy = np.mean(signal[ch_idx] ** 2)
 
-        # Iterate over each decomposition level (excluding the approximation coefficients at level 0)
-        for lvl in range(1, len(coeffs)):
-            # Compute an adaptive threshold based on the coefficients, channel energy, and current level
-            T = adaptive_threshold(coeffs[lvl], channel_energy, lvl)
-            # Apply hard thresholding to the detail coefficients
-            coeffs[lvl] = hard_threshold(coeffs[lvl], T)
+def _denoise_block(block, wavelet, level, method):
+    """Adaptive denoising of a block of channels, one batched pass per level"""
+    # Decompose every channel of the block in one call
+    coeffs = batched_wavedec(block, wavelet, level, method=method)
+    # Energy of each channel (mean of squared signal values), kept as a column
+    channel_energy = np.mean(block ** 2, axis=-1, keepdims=True)
 
-        # Append the denoised coefficients for this channel to the list
-        denoised_coeffs.append(coeffs)
+    # Iterate over each decomposition level (excluding the approximation coefficients at level 0)
+    for lvl in range(1, len(coeffs)):
+        # One adaptive threshold per channel, with the MAD taken over the whole level block at once
+        T = adaptive_threshold(coeffs[lvl], channel_energy, lvl, axis=-1)
+        # Apply hard thresholding to the detail coefficients
+        coeffs[lvl] = hard_threshold(coeffs[lvl], T)
+
+    # Reconstruct the block from the thresholded coefficients
+    return batched_waverec(coeffs, wavelet, method=method)
+
+
+def adaptive_wavelet_denoise(signal, wavelet="db4", level=5, n_jobs=1, method="auto"):
+    # Channels are independent: split them into contiguous cache-sized blocks
+    # (at least one per thread) and denoise each block batched
+    n_blocks = max(resolve_n_jobs(n_jobs), -(-signal.size // BLOCK_ELEMENTS))
+    blocks = np.array_split(signal, min(n_blocks, signal.shape[0]))
+    denoised = map_channels(partial(_denoise_block, wavelet=wavelet, level=level, method=method),
+                            blocks, n_jobs)
+    return np.vstack(denoised)
+
+
+def spatial_adaptive_wavelet_denoise(signal, neighbors, wavelet="db4", level=5, method="auto"):
+    """
+    Adaptive denoising with thresholds pooled across neighbouring electrodes
+    neighbors: index from channel_neighbors.build_neighbor_index (built once per montage)
+    """
+    # Decompose all channels in one batched call
+    coeffs = batched_wavedec(signal, wavelet, level, method=method)
+
+    # (channels x levels) statistics, then every threshold in one vectorised pass
+    sigma, energy = level_statistics(coeffs[1:])
+    T = spatial_adaptive_threshold(sigma, energy, neighbors)
+
+    # Apply hard thresholding to every detail level with the per-channel thresholds
+    for lvl in range(1, len(coeffs)):
+        coeffs[lvl] = hard_threshold(coeffs[lvl], T[:, lvl - 1:lvl])
 
     # Reconstruct the denoised signal from the thresholded coefficients
-    return wavelet_reconstruct(denoised_coeffs, wavelet)
\ No newline at end of file
+    return batched_waverec(coeffs, wavelet, method=method)
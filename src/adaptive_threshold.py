@@ -1,22 +1,70 @@
 import numpy as np
 
-def adaptive_threshold(coeffs, channel_energy, level):
+def adaptive_threshold(coeffs, channel_energy, level, axis=None):
     """
     Mild adaptive threshold for EEG denoising
+    axis: None computes one threshold from all of coeffs; an integer computes
+          one threshold per vector along that axis (channel_energy must then
+          broadcast against coeffs with a length-1 dimension on that axis)
     """
 
     # Robust noise estimate using median absolute deviation
-    sigma = np.median(np.abs(coeffs)) / 0.6745
+    sigma = np.median(np.abs(coeffs), axis=axis, keepdims=axis is not None) / 0.6745
 
     #Mild effect of decomposition level (previously was 0.2)
     alpha = 1 + 0.05 * level
 
     #Normalize channel energy
-    beta = channel_energy / np.median(channel_energy)
+    if axis is None:
+        beta = channel_energy / np.median(channel_energy)
+    else:
+        beta = channel_energy / np.median(channel_energy, axis=axis, keepdims=True)
 
     #Overall scaling factor to prevent over-smoothing (very important)
     gamma = 0.4
 
     # Calculate the adaptive threshold
     T = gamma * alpha * beta * sigma
-    return T
\ No newline at end of file
+    return T
+
+
+def level_statistics(details):
+    """
+    Per-channel, per-level statistics matrix for spatial thresholding
+    details: detail arrays [cDL, ..., cD1] with channels on axis 0 (coeffs[1:] of a batched wavedec)
+    return: (sigma, energy), each (n_channels, n_levels): MAD noise estimate and
+            mean coefficient energy; column i belongs to coeffs[i + 1]
+    """
+    # One vectorised reduction per level, over all channels at once
+    sigma = np.stack([np.median(np.abs(d), axis=-1) for d in details], axis=1) / 0.6745
+    energy = np.stack([np.mean(d ** 2, axis=-1) for d in details], axis=1)
+    return sigma, energy
+
+
+def spatial_adaptive_threshold(sigma, energy, neighbors, beta_range=(0.5, 2.0)):
+    """
+    Spatially adaptive threshold for all channels and levels in one pass
+    sigma, energy: (n_channels, n_levels) from level_statistics
+    neighbors: (n_channels, k) index from channel_neighbors.build_neighbor_index
+    beta_range: limits of the cross-channel energy normalization
+    return: thresholds (n_channels, n_levels), column i for coeffs[i + 1]
+    """
+
+    # Noise estimate pooled over each electrode and its neighbours (median), so
+    # a bad electrode does not leak into its neighbours' thresholds; a channel
+    # keeps its own estimate when that is higher (an electrode noisier than
+    # its neighbourhood), and never drops below its neighbourhood's level
+    sigma_pooled = np.maximum(sigma, np.median(sigma[neighbors], axis=1))
+
+    #Same mild level effect as adaptive_threshold
+    alpha = 1 + 0.05 * np.arange(1, sigma.shape[1] + 1)
+
+    #Normalize each channel's energy by the whole cap, per level (bounded)
+    beta = np.clip(energy / np.median(energy, axis=0, keepdims=True), *beta_range)
+
+    #Overall scaling factor to prevent over-smoothing (very important)
+    gamma = 0.4
+
+    # Calculate the spatially adaptive thresholds
+    T = gamma * alpha * beta * sigma_pooled
+    return T
@@ -0,0 +1,192 @@
+"""
+Automatic wavelet and decomposition-level selection under a time budget.
+
+Each candidate wavelet is decomposed once, at the maximum level, keeping the
+intermediate approximations. A level-j decomposition is contained in it (the
+same details cD1..cDj plus the stored cAj), so choosing the level per channel
+only means choosing how many of the finest detail levels get thresholded; no
+transform is repeated per (wavelet, level) candidate.
+"""
+
+import time
+import numpy as np
+import pywt
+from adaptive_threshold import adaptive_threshold
+from threshold_rules import rigrsure, hard_threshold
+from fft_filter_bank import use_fft, fft_dwt
+
+
+def max_level(n_samples, wavelet, cap=8):
+    """
+    Deepest useful level for this signal length and filter, at most cap
+    """
+    return max(1, min(cap, pywt.dwt_max_level(n_samples, pywt.Wavelet(wavelet).dec_len)))
+
+
+def decompose_max_level(signal, wavelet, level, method="auto"):
+    """
+    Multilevel DWT along the last axis that also keeps every approximation
+    return: (coeffs, approximations) with coeffs = [cAL, cDL, ..., cD1] as from
+            pywt.wavedec and approximations = [cA1, ..., cAL]
+    """
+    fft = use_fft(wavelet, signal.shape[-1], method)
+    details = []
+    approximations = []
+    a = signal
+    for _ in range(level):
+        a, d = fft_dwt(a, wavelet) if fft else pywt.dwt(a, wavelet, axis=-1)
+        details.append(d)
+        approximations.append(a)
+    return [a] + details[::-1], approximations
+
+
+def select_levels(coeffs, noise_ratio=2.0, min_level=1):
+    """
+    Per-channel decomposition level from a max-level decomposition already in hand
+    coeffs: batched wavedec output [cAL, cDL, ..., cD1] (channels on axis 0)
+    A detail level counts as noise-dominated while its mean energy stays within
+    noise_ratio times the noise variance estimated from cD1 (MAD); the level is
+    the number of consecutive noise-dominated levels counted from the finest.
+    return: (levels, sigma), both of shape (n_channels,)
+    """
+    details = coeffs[:0:-1]  # cD1 (finest) ... cDL (coarsest)
+    # Robust noise estimate from the finest detail level
+    sigma = np.median(np.abs(details[0]), axis=-1) / 0.6745
+    # Energy per coefficient of every detail level, relative to the noise variance
+    energy = np.stack([np.mean(d ** 2, axis=-1) for d in details], axis=-1)
+    ratios = energy / (sigma[:, None] ** 2 + 1e-300)
+    # Length of the leading run of noise-dominated levels
+    noisy = ratios <= noise_ratio
+    levels = np.where(noisy.all(axis=-1), len(details), np.argmin(noisy, axis=-1))
+    return np.clip(levels, min_level, len(details)), sigma
+
+
+def compaction_score(coeffs, levels, sigma):
+    """
+    Wavelet quality score: share of the thresholded detail energy carried by
+    coefficients above the universal threshold sigma * sqrt(2 ln n).
+    Higher means the signal is packed into fewer large coefficients, which
+    thresholding separates more cleanly from the noise.
+    """
+    n_levels = len(coeffs) - 1
+    kept = 0.0
+    total = 0.0
+    for k in range(1, n_levels + 1):
+        d = coeffs[n_levels - k + 1]  # cDk
+        active = (levels >= k)[:, None]
+        universal = sigma[:, None] * np.sqrt(2 * np.log(d.shape[-1]))
+        energy = np.where(active, d ** 2, 0.0)
+        total += energy.sum()
+        kept += np.where(np.abs(d) > universal, energy, 0.0).sum()
+    return kept / total if total > 0 else 0.0
+
+
+def auto_configure(signal, wavelets=("db4", "dmey"), time_budget=None, per_channel=True,
+                   noise_ratio=2.0, min_level=1, level_cap=8):
+    """
+    Choose wavelet and decomposition level(s) for one recording.
+    signal: shape (n_channels, n_samples)
+    time_budget: seconds available for configuration plus denoising (None = no limit).
+        Candidates are tried shortest filter first. Decomposition cost is assumed
+        proportional to filter length, scaled from the first measured transform;
+        a candidate is skipped if its transform plus the threshold and
+        reconstruction passes (about two more transforms) would overrun the budget.
+        The first candidate always runs.
+    per_channel: one level per channel, or the median level for the whole recording
+    return: dict with "wavelet", "levels", "coeffs" and "approximations" (max-level
+            decomposition of the chosen wavelet, reused for denoising), "scores"
+            and "elapsed"
+    """
+    n_samples = signal.shape[-1]
+    candidates = sorted(wavelets, key=lambda w: pywt.Wavelet(w).dec_len)
+
+    start = time.perf_counter()
+    seconds_per_tap = None
+    best = None
+    scores = {}
+    for w in candidates:
+        filter_len = pywt.Wavelet(w).dec_len
+        if best is not None and time_budget is not None:
+            spent = time.perf_counter() - start
+            estimate = seconds_per_tap * filter_len
+            if spent + 3 * estimate > time_budget:
+                continue
+
+        t0 = time.perf_counter()
+        coeffs, approximations = decompose_max_level(signal, w, max_level(n_samples, w, level_cap))
+        if seconds_per_tap is None:
+            seconds_per_tap = (time.perf_counter() - t0) / filter_len
+
+        levels, sigma = select_levels(coeffs, noise_ratio, min_level)
+        if not per_channel:
+            levels = np.full_like(levels, int(np.median(levels)))
+        scores[w] = compaction_score(coeffs, levels, sigma)
+        if best is None or scores[w] > scores[best["wavelet"]]:
+            best = {"wavelet": w, "levels": levels, "coeffs": coeffs,
+                    "approximations": approximations}
+
+    best["scores"] = scores
+    best["elapsed"] = time.perf_counter() - start
+    return best
+
+
+def auto_wavelet_denoise(signal, wavelets=("db4", "dmey"), time_budget=None, rule="adaptive",
+                         per_channel=True, config=None):
+    """
+    Denoise with an automatically chosen wavelet and per-channel level.
+    rule: "adaptive" (adaptive_threshold) or "sure" (rigrsure), both with hard thresholding
+    config: output of auto_configure to reuse (its coefficients are used directly)
+    With a single wavelet and the same level on every channel this gives the
+    same result as adaptive_wavelet_denoise / baseline_wavelet_denoise at that level.
+    """
+    if rule not in ("adaptive", "sure"):
+        raise ValueError(f"Unknown threshold rule: {rule}")
+    if config is None:
+        config = auto_configure(signal, wavelets, time_budget, per_channel)
+
+    coeffs = list(config["coeffs"])
+    approximations = config["approximations"]
+    wavelet = config["wavelet"]
+    levels = config["levels"][:, None]
+    n_levels = len(coeffs) - 1
+    channel_energy = np.mean(signal ** 2, axis=-1, keepdims=True)
+
+    for idx in range(1, n_levels + 1):
+        # coeffs[idx] is cDk; only channels whose level reaches k are thresholded
+        k = n_levels - idx + 1
+        active = levels >= k
+        if rule == "adaptive":
+            # The adaptive rule's level term is cDk's position in a level-j decomposition
+            T = adaptive_threshold(coeffs[idx], channel_energy, levels - k + 1, axis=-1)
+        else:
+            T = rigrsure(coeffs[idx], axis=-1)
+        # A zero threshold leaves the coefficients of inactive channels untouched
+        coeffs[idx] = hard_threshold(coeffs[idx], np.where(active, T, 0))
+
+    # Inverse transform from the coarsest level down; a channel with level j
+    # restarts from its stored cAj, exactly as a level-j reconstruction would
+    a = coeffs[0]
+    for idx in range(1, n_levels + 1):
+        k = n_levels - idx + 1
+        d = coeffs[idx]
+        # Same length rule as pywt.waverec
+        if a.shape[-1] == d.shape[-1] + 1:
+            a = a[..., :-1]
+        a = pywt.idwt(a, d, wavelet, axis=-1)
+        if k > 1:
+            a = np.where(levels >= k, a[..., :approximations[k - 2].shape[-1]], approximations[k - 2])
+    return a
+
+
+if __name__ == "__main__":
+    from load_data import load_eeg
+    from preprocessing import basic_preprocessing
+    from segment import extract_segment
+
+    raw = basic_preprocessing(load_eeg("sub-001"))
+    segment, sfreq = extract_segment(raw)
+    config = auto_configure(segment * 1e6, time_budget=1.0)
+    print("Chosen wavelet:", config["wavelet"])
+    print("Scores:", config["scores"])
+    print("Levels per channel:", config["levels"])
+    print(f"Configuration time: {config['elapsed'] * 1e3:.1f} ms")
@@ -1,24 +1,28 @@
-from wavelet_utils import wavelet_decompose, wavelet_reconstruct
+from wavelet_utils import wavelet_decompose, wavelet_reconstruct, map_channels
 from threshold_rules import rigrsure, hard_threshold
 import numpy as np
+from functools import partial
 
 
-def baseline_wavelet_denoise(signal, wavelet="db4", level=5):
-    # Perform wavelet decomposition on the input signal up to the specified level
-    coeffs_all = wavelet_decompose(signal, wavelet, level)
+def _threshold_channel(coeffs, sure_method="sort"):
+    # Skip the approximation coefficients (coeffs[0]) - we don't modify them
+    for i in range(1, len(coeffs)):
+        # Calculate threshold using the rigrsure (Stein's Unbiased Risk Estimate) method
+        T = rigrsure(coeffs[i], method=sure_method)
+        # Apply hard thresholding to the detail coefficients
+        coeffs[i] = hard_threshold(coeffs[i], T)
+    return coeffs
+
 
-    # Iterate over each channel's coefficients
-    for ch_idx, coeffs in enumerate(coeffs_all):
-        # Skip the approximation coefficients (coeffs[0]) - we don't modify them
-        for i in range(1, len(coeffs)):
-            # Calculate threshold using the rigrsure (Stein's Unbiased Risk Estimate) method
-            T = rigrsure(coeffs[i])
-            # Apply hard thresholding to the detail coefficients
-            coeffs[i] = hard_threshold(coeffs[i], T)
+def baseline_wavelet_denoise(signal, wavelet="db4", level=5, n_jobs=1, method="auto",
+                             sure_method="sort"):
+    # Perform wavelet decomposition on the input signal up to the specified level
+    coeffs_all = wavelet_decompose(signal, wavelet, level, n_jobs=n_jobs, method=method)
 
-        # Store the denoised coefficients for this channel
-        coeffs_all[ch_idx] = coeffs
+    # Threshold each channel's coefficients (channels are independent, so they can run in parallel)
+    coeffs_all = map_channels(partial(_threshold_channel, sure_method=sure_method),
+                              coeffs_all, n_jobs)
 
     # Reconstruct the denoised signal from the thresholded coefficients
-    denoised = wavelet_reconstruct(coeffs_all, wavelet)
-    return denoised
\ No newline at end of file
+    denoised = wavelet_reconstruct(coeffs_all, wavelet, n_jobs=n_jobs, method=method)
+    return denoised
@@ -0,0 +1,56 @@
+"""
+Filter Bank Benchmark: Direct vs FFT
+------------------------------------
+Times wavelet_decompose / wavelet_reconstruct with pywt's direct convolution
+and with the batched FFT filter bank for short (db4) and long (dmey) filters,
+reports the largest coefficient and reconstruction differences, and shows
+which path method="auto" picks.
+"""
+
+import numpy as np
+import pywt
+from wavelet_utils import wavelet_decompose, wavelet_reconstruct
+from fft_filter_bank import use_fft
+from benchmark_utils import time_call
+
+
+# ============================
+# Configuration
+# ============================
+channel_counts = [63, 256]
+sfreq = 500
+durations_sec = [10, 300]
+wavelets = ["db4", "dmey"]
+level = 5
+n_repeats = 3
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    for n_channels in channel_counts:
+        for duration in durations_sec:
+            signal = 10 * rng.normal(size=(n_channels, int(duration * sfreq)))
+            for w in wavelets:
+                filter_len = pywt.Wavelet(w).dec_len
+                auto_dec = "fft" if use_fft(w, signal.shape[1]) else "direct"
+                auto_rec = "fft" if use_fft(w, signal.shape[1], inverse=True) else "direct"
+                print(f"\n{w} ({filter_len} taps) - {n_channels} channels x {signal.shape[1]} samples"
+                      f" - auto picks: {auto_dec} / {auto_rec}")
+
+                dec_direct, coeffs_direct = time_call(wavelet_decompose, signal, w, level,
+                                                      method="direct", n_repeats=n_repeats)
+                dec_fft, coeffs_fft = time_call(wavelet_decompose, signal, w, level,
+                                                method="fft", n_repeats=n_repeats)
+                rec_direct, rec_d = time_call(wavelet_reconstruct, coeffs_direct, w,
+                                              method="direct", n_repeats=n_repeats)
+                rec_fft, rec_f = time_call(wavelet_reconstruct, coeffs_direct, w,
+                                           method="fft", n_repeats=n_repeats)
+
+                coeff_err = max(np.max(np.abs(a - b))
+                                for ch_d, ch_f in zip(coeffs_direct, coeffs_fft)
+                                for a, b in zip(ch_d, ch_f))
+                rec_err = np.max(np.abs(rec_d - rec_f))
+                print(f"  decompose:   direct {dec_direct * 1e3:8.1f} ms  fft {dec_fft * 1e3:8.1f} ms"
+                      f"  speedup {dec_direct / dec_fft:5.2f}x  max |diff| {coeff_err:.1e}")
+                print(f"  reconstruct: direct {rec_direct * 1e3:8.1f} ms  fft {rec_fft * 1e3:8.1f} ms"
+                      f"  speedup {rec_direct / rec_fft:5.2f}x  max |diff| {rec_err:.1e}")
@@ -0,0 +1,53 @@
+"""
+Thread Scaling Benchmark
+------------------------
+Times the baseline and adaptive denoisers with 1..N threads on synthetic
+63- and 256-channel recordings and checks that every threaded result is
+bit-identical to the serial one.
+"""
+
+import os
+import numpy as np
+from baseline_denoise import baseline_wavelet_denoise
+from adaptive_denoise import adaptive_wavelet_denoise
+from benchmark_utils import time_call
+
+
+# ============================
+# Configuration
+# ============================
+channel_counts = [63, 256]
+sfreq = 500
+duration_sec = 60
+wavelets = ["db4", "dmey"]
+max_threads = os.cpu_count() or 1
+n_repeats = 3
+
+
+def make_signal(n_channels, seed=0):
+    """Synthetic EEG-like signal in microvolts (white noise + 10 Hz alpha)"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration_sec * sfreq)) / sfreq
+    alpha = 20 * np.sin(2 * np.pi * 10 * t)
+    return rng.normal(scale=10, size=(n_channels, t.size)) + alpha
+
+
+if __name__ == "__main__":
+    thread_counts = sorted({1, 2, 4, 8, max_threads})
+    print(f"Thread counts: {thread_counts} (cores available: {max_threads})")
+
+    for n_channels in channel_counts:
+        signal = make_signal(n_channels)
+        for w in wavelets:
+            for name, method in [("Baseline", baseline_wavelet_denoise),
+                                 ("Adaptive", adaptive_wavelet_denoise)]:
+                print(f"\n{name} - {w} - {n_channels} channels x {signal.shape[1]} samples")
+                serial_time, serial = time_call(method, signal, wavelet=w, n_jobs=1, n_repeats=n_repeats)
+                for n_jobs in thread_counts:
+                    if n_jobs == 1:
+                        elapsed, identical = serial_time, True
+                    else:
+                        elapsed, result = time_call(method, signal, wavelet=w, n_jobs=n_jobs, n_repeats=n_repeats)
+                        identical = np.array_equal(serial, result)
+                    print(f"  threads={n_jobs:2d}  time={elapsed * 1e3:8.1f} ms  "
+                          f"speedup={serial_time / elapsed:5.2f}x  identical={identical}")
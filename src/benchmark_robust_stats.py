@@ -0,0 +1,100 @@
+"""
+Robust Statistics: Accuracy vs Speed Report
+-------------------------------------------
+Times the threshold statistics on the detail levels of synthetic 63- and
+256-channel recordings, every algorithm both per channel (one call per
+channel) and batched (one call per level block), so the effect of batching
+is kept apart from the effect of the algorithm:
+- MAD median (np.median)
+- SURE: full-sort rigrsure vs the O(n) selection, checked against the sort
+- Streaming median (online path) vs the exact median of the same data,
+  in microvolts and in volts (the relative update is scale-free)
+"""
+
+import time
+import numpy as np
+import pywt
+from threshold_rules import rigrsure
+from robust_stats import update_running_median
+from benchmark_utils import time_call
+
+
+# ============================
+# Configuration
+# ============================
+channel_counts = [63, 256]
+sfreq = 500
+duration_sec = 300
+wavelet = "db4"
+level = 5
+stream_block_sec = 1
+stream_step = 0.01
+n_repeats = 3
+
+
+def make_signal(n_channels, seed=0):
+    """Heavy-tailed synthetic EEG-like signal in microvolts"""
+    rng = np.random.default_rng(seed)
+    return 10 * rng.standard_t(4, size=(n_channels, int(duration_sec * sfreq)))
+
+
+def median_per_channel(levels):
+    return [np.array([np.median(np.abs(ch)) for ch in block]) for block in levels]
+
+
+def median_batched(levels):
+    return [np.median(np.abs(block), axis=-1) for block in levels]
+
+
+def sure_per_channel(levels, method):
+    return [np.array([rigrsure(ch, method=method) for ch in block]) for block in levels]
+
+
+def sure_batched(levels, method):
+    return [rigrsure(block, axis=-1, method=method)[:, 0] for block in levels]
+
+
+def max_rel_error(reference, approx):
+    return max(np.max(np.abs(a - r) / np.maximum(np.abs(r), 1e-12))
+               for r, a in zip(reference, approx))
+
+
+if __name__ == "__main__":
+    for n_channels in channel_counts:
+        signal = make_signal(n_channels)
+        levels = pywt.wavedec(signal, wavelet, level=level, axis=-1)[1:]
+        print(f"\n{n_channels} channels x {signal.shape[1]} samples ({wavelet}, level {level})")
+        print(f"  {'statistic':<22}{'per channel (ms)':>18}{'batched (ms)':>14}"
+              f"{'max rel err':>13}{'exact match':>13}")
+
+        # Reference values: np.median and full-sort SURE, per channel
+        median_ref = median_per_channel(levels)
+        sure_ref = sure_per_channel(levels, "sort")
+        rows = [
+            ("median: np.median", median_per_channel, median_batched, {}, median_ref),
+            ("SURE: full sort", sure_per_channel, sure_batched, {"method": "sort"}, sure_ref),
+            ("SURE: selection", sure_per_channel, sure_batched, {"method": "select"}, sure_ref),
+        ]
+        for label, per_channel, batched, kwargs, ref in rows:
+            loop_time, loop_result = time_call(per_channel, levels, n_repeats=n_repeats, **kwargs)
+            batch_time, batch_result = time_call(batched, levels, n_repeats=n_repeats, **kwargs)
+            # Both layouts must give the reference value on every channel
+            err = max(max_rel_error(ref, loop_result), max_rel_error(ref, batch_result))
+            match = np.mean(np.concatenate([(r == a) & (r == b)
+                                            for r, a, b in zip(ref, loop_result, batch_result)]))
+            print(f"  {label:<22}{loop_time * 1e3:18.1f}{batch_time * 1e3:14.1f}"
+                  f"{err:13.2e}{match * 100:12.1f}%")
+
+        # Streaming median on the finest level, fed one block at a time
+        block = max(1, int(stream_block_sec * sfreq) // 2)
+        for unit, scale in [("uV", 1.0), ("V", 1e-6)]:
+            finest = np.abs(levels[-1]) * scale
+            exact = np.median(finest, axis=-1)
+            estimate = None
+            start = time.perf_counter()
+            for i in range(0, finest.shape[1], block):
+                estimate = update_running_median(estimate, finest[:, i:i + block], stream_step)
+            elapsed = time.perf_counter() - start
+            err = np.max(np.abs(estimate - exact) / exact)
+            label = f"streaming median ({unit})"
+            print(f"  {label:<22}{'':>18}{elapsed * 1e3:14.1f}{err:13.2e}{'-':>13}")
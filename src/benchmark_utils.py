@@ -0,0 +1,12 @@
+import time
+import numpy as np
+
+
+def time_call(func, *args, n_repeats=3, **kwargs):
+    """Best wall-clock time over n_repeats runs, plus the last result"""
+    best = np.inf
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+def montage_positions(raw):
+    """
+    Electrode positions (n_channels, 3) from a Raw object with a montage set
+    (see preprocessing.basic_preprocessing); channels without a position are NaN
+    """
+    positions = np.array([ch["loc"][:3] for ch in raw.info["chs"]], dtype=float)
+    # MNE stores unknown positions as zeros or NaN
+    missing = ~np.isfinite(positions).all(axis=1) | (np.abs(positions).sum(axis=1) == 0)
+    positions[missing] = np.nan
+    return positions
+
+
+def build_neighbor_index(positions, n_neighbors=6):
+    """
+    Nearest-neighbour index for every channel, computed once per montage
+    positions: (n_channels, 3) electrode coordinates (NaN = unknown)
+    return: int array (n_channels, n_neighbors + 1); column 0 is the channel
+            itself, the rest are its nearest electrodes. Channels without a
+            position only list themselves (repeated), so pooling leaves them as is.
+    """
+    positions = np.asarray(positions, dtype=float)
+    n_channels = positions.shape[0]
+    n_neighbors = min(n_neighbors, n_channels - 1)
+
+    # Pairwise distances; unknown positions are infinitely far from everything
+    dist = np.linalg.norm(positions[:, None, :] - positions[None, :, :], axis=-1)
+    dist[np.isnan(dist)] = np.inf
+    np.fill_diagonal(dist, -1)  # self always first
+
+    order = np.argsort(dist, axis=1)[:, :n_neighbors + 1]
+    # Replace "neighbours" that are infinitely far with the channel itself
+    too_far = np.isinf(np.take_along_axis(dist, order, axis=1))
+    order[too_far] = np.broadcast_to(np.arange(n_channels)[:, None], order.shape)[too_far]
+    return order
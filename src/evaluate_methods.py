@@ -1,21 +1,38 @@
 from metrics import compute_snr, compute_rmse, compute_corr
+from metrics import BANDS, compute_spectra, compute_band_powers, compute_band_ratio
 
-def evaluate(clean, noisy, baseline, adaptive):
+def evaluate(clean, noisy, baseline, adaptive, sfreq=None, spatial=None):
     # Initialize an empty dictionary to store all evaluation results
     results = {}
 
+    # Denoised signals to score; the spatial adaptive output is optional
+    denoised = {"Baseline": baseline, "Adaptive": adaptive}
+    if spatial is not None:
+        denoised["Spatial"] = spatial
+
     # Calculate Signal-to-Noise Ratio (SNR) for each signal type
     results["Noisy SNR"] = compute_snr(clean, noisy)
-    results["Baseline SNR"] = compute_snr(clean, baseline)
-    results["Adaptive SNR"] = compute_snr(clean, adaptive)
+    for name, signal in denoised.items():
+        results[f"{name} SNR"] = compute_snr(clean, signal)
 
     # Calculate Root Mean Square Error (RMSE) for denoised signals
-    results["Baseline RMSE"] = compute_rmse(clean, baseline)
-    results["Adaptive RMSE"] = compute_rmse(clean, adaptive)
+    for name, signal in denoised.items():
+        results[f"{name} RMSE"] = compute_rmse(clean, signal)
 
     # Calculate Pearson correlation coefficient for denoised signals
-    results["Baseline Corr"] = compute_corr(clean, baseline)
-    results["Adaptive Corr"] = compute_corr(clean, adaptive)
+    for name, signal in denoised.items():
+        results[f"{name} Corr"] = compute_corr(clean, signal)
+
+    # Band power preservation relative to the clean signal (needs the sampling rate)
+    if sfreq is not None:
+        # One batched Welch pass for all signals, shared by every band
+        signals = {"Clean": clean, "Noisy": noisy, **denoised}
+        freqs, psd = compute_spectra(signals, sfreq)
+        clean_power = compute_band_powers(freqs, psd["Clean"])
+        for name in ["Noisy", *denoised]:
+            ratios = compute_band_ratio(clean_power, compute_band_powers(freqs, psd[name]))
+            for band, ratio in zip(BANDS, ratios):
+                results[f"{name} {band} Ratio (dB)"] = ratio
 
     # Return the dictionary containing all computed metrics
     return results
\ No newline at end of file
@@ -0,0 +1,177 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import pywt
+from scipy import fft as sp_fft
+
+
+# Filters at least this long go through the FFT filter bank in "auto" mode
+# (db4 has 8 taps and stays on pywt's direct convolution, dmey has 62)
+FFT_MIN_FILTER_LEN = 32
+# Below this many samples per channel the FFT setup cost is not worth it
+FFT_MIN_SAMPLES = 1024
+# Frame length for the overlap-save convolution of long signals
+FFT_FRAME_LEN = 1024
+
+
+def use_fft(wavelet, n_samples, method="auto", inverse=False):
+    """
+    Decide between direct (pywt) and FFT convolution
+    method: "direct", "fft" or "auto" (by filter length and signal size)
+    inverse: True for reconstruction. pywt's synthesis step already skips the
+             zero-stuffed samples (about half the taps per output), and in
+             benchmark_filter_bank.py the FFT inverse is at best on par with it,
+             so "auto" keeps reconstruction on the direct path
+    """
+    if method == "direct":
+        return False
+    if method == "fft":
+        return True
+    if method != "auto":
+        raise ValueError(f"Unknown filter bank method: {method}")
+    if inverse:
+        return False
+    filter_len = pywt.Wavelet(wavelet).dec_len
+    return filter_len >= FFT_MIN_FILTER_LEN and n_samples >= FFT_MIN_SAMPLES
+
+
+def _frame_spectra(x, n_fft, step, n_frames, workers=None):
+    """rfft of n_frames overlapping frames (hop = step) taken from the start of x"""
+    frames = sliding_window_view(x, n_fft, axis=-1)[..., :(n_frames - 1) * step + 1:step, :]
+    return sp_fft.rfft(frames, axis=-1, workers=workers)
+
+
+def _fft_conv(inputs, kernel_sets, start, n_out, shifts=None, workers=None):
+    """
+    Batched FFT convolution along the last axis (overlap-save).
+    inputs: list of arrays; input p is treated as delayed by shifts[p] samples
+    kernel_sets: list of kernel lists, one kernel per input
+    return: for each kernel set, sum_p conv(inputs[p], kernels[p])[start:start + n_out]
+    Long signals are cut into fixed-size overlapping frames, so every FFT stays
+    short; each input spectrum is computed once and shared by all kernel sets.
+    """
+    shifts = shifts or [0] * len(inputs)
+    kernel_len = len(kernel_sets[0][0])
+    # One frame for short signals, fixed-size frames for long ones
+    n_fft = sp_fft.next_fast_len(min(n_out + kernel_len - 1,
+                                     max(FFT_FRAME_LEN, 4 * kernel_len)), real=True)
+    step = n_fft - kernel_len + 1
+    n_frames = -(-n_out // step)
+    # First input sample that feeds output `start`
+    lo = start - kernel_len + 1
+
+    # Shift each input so index 0 is its first needed sample (zero-fill on the left if needed)
+    aligned = []
+    for x, shift in zip(inputs, shifts):
+        first = lo - shift
+        if first < 0:
+            x = np.pad(x, [(0, 0)] * (x.ndim - 1) + [(-first, 0)])
+            first = 0
+        aligned.append(x[..., first:])
+
+    # Frames that lie entirely inside every input are read in place; the rest
+    # (at most a couple at the end) come from a short zero-padded tail
+    n_inside = min(n_frames, min(max(0, (x.shape[-1] - n_fft) // step + 1) for x in aligned))
+    chunks = []
+    if n_inside:
+        chunks.append([_frame_spectra(x, n_fft, step, n_inside, workers) for x in aligned])
+    if n_inside < n_frames:
+        tail_len = (n_frames - n_inside - 1) * step + n_fft
+        tails = []
+        for x in aligned:
+            tail = x[..., n_inside * step:n_inside * step + tail_len]
+            tail = np.pad(tail, [(0, 0)] * (x.ndim - 1) + [(0, tail_len - tail.shape[-1])])
+            tails.append(_frame_spectra(tail, n_fft, step, n_frames - n_inside, workers))
+        chunks.append(tails)
+
+    outputs = []
+    for kernels in kernel_sets:
+        kernel_spectra = [sp_fft.rfft(h, n_fft) for h in kernels]
+        pieces = []
+        for spectra in chunks:
+            total = spectra[0] * kernel_spectra[0]
+            for spec, h_spec in zip(spectra[1:], kernel_spectra[1:]):
+                total += spec * h_spec
+            # Keep the alias-free part of every frame and stitch the frames together
+            y = sp_fft.irfft(total, n_fft, axis=-1, workers=workers)[..., kernel_len - 1:]
+            pieces.append(y.reshape(y.shape[:-2] + (-1,)))
+        outputs.append(np.concatenate(pieces, axis=-1)[..., :n_out] if len(pieces) > 1
+                       else pieces[0][..., :n_out])
+    return outputs
+
+
+def fft_dwt(x, wavelet, workers=None):
+    """
+    Single-level DWT along the last axis with 'symmetric' extension, like pywt.dwt.
+    Polyphase form: the even and odd input samples are convolved with the even
+    and odd filter taps at half rate, so the decimated outputs are computed
+    directly. Both filters share the input spectra.
+    return: (cA, cD)
+    """
+    w = pywt.Wavelet(wavelet)
+    filter_len = w.dec_len
+    n = x.shape[-1]
+    n_out = (n + filter_len - 1) // 2
+
+    # Symmetric extension by filter_len - 1 samples on each side (pywt's 'symmetric' mode)
+    ext = np.pad(x, [(0, 0)] * (x.ndim - 1) + [(filter_len - 1, filter_len - 1)], mode="symmetric")
+
+    dec_lo, dec_hi = np.asarray(w.dec_lo), np.asarray(w.dec_hi)
+    # cA[i] = sum_j h[j] ext[filter_len + 2i - j]; even taps see ext[0::2],
+    # odd taps see ext[1::2] delayed by one half-rate sample
+    cA, cD = _fft_conv([ext[..., 0::2], ext[..., 1::2]],
+                       [[dec_lo[0::2], dec_lo[1::2]], [dec_hi[0::2], dec_hi[1::2]]],
+                       filter_len // 2, n_out, shifts=[0, 1], workers=workers)
+    return cA, cD
+
+
+def fft_idwt(cA, cD, wavelet, workers=None):
+    """
+    Single-level inverse DWT along the last axis for 'symmetric' mode, like pywt.idwt.
+    Polyphase form: the even and odd output samples come from half-rate
+    convolutions with the even and odd synthesis taps, with no zero-stuffing.
+    """
+    w = pywt.Wavelet(wavelet)
+    filter_len = w.rec_len
+    n = cA.shape[-1]
+    n_out = 2 * n - filter_len + 2
+
+    rec_lo, rec_hi = np.asarray(w.rec_lo), np.asarray(w.rec_hi)
+    # Even and odd output phases, each summing the approximation and detail branches
+    even, odd = _fft_conv([cA, cD], [[rec_lo[0::2], rec_hi[0::2]], [rec_lo[1::2], rec_hi[1::2]]],
+                          filter_len // 2 - 1, n_out // 2, workers=workers)
+
+    # Interleave the two phases back into one signal
+    y = np.empty(cA.shape[:-1] + (n_out,))
+    y[..., 0::2] = even
+    y[..., 1::2] = odd
+    return y
+
+
+def fft_wavedec(signal, wavelet, level, workers=None):
+    """
+    Multilevel DWT along the last axis, like pywt.wavedec(..., axis=-1)
+    return: [cAn, cDn, ..., cD1], each with all channels batched
+    """
+    coeffs = []
+    a = np.asarray(signal, dtype=float)
+    for _ in range(level):
+        a, d = fft_dwt(a, wavelet, workers)
+        coeffs.append(d)
+    coeffs.append(a)
+    coeffs.reverse()
+    return coeffs
+
+
+def fft_waverec(coeffs, wavelet, workers=None):
+    """
+    Multilevel inverse DWT along the last axis, like pywt.waverec(..., axis=-1)
+    """
+    a = coeffs[0]
+    for d in coeffs[1:]:
+        # pywt drops the extra approximation sample when lengths differ by one
+        if a.shape[-1] == d.shape[-1] + 1:
+            a = a[..., :-1]
+        elif a.shape[-1] != d.shape[-1]:
+            raise ValueError("coefficient shape mismatch")
+        a = fft_idwt(a, d, wavelet, workers)
+    return a
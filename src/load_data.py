@@ -1,9 +1,10 @@
 import os
 import mne
 
-def load_eeg(subject_id):
+def load_eeg(subject_id, preload=True):
     """
     Load EEG data for a given subject from Windows path
+    preload=False only reads the header (channel count, length, sampling rate)
     """
     # مسیر دیتاست کامل در ویندوز (بعد از استخراج)
     win_path = "/mnt/c/Users/Asus/Downloads/dataset_Rest eyes open - Parkinsons Disease 64-Channel EEG/ds004584-download"
@@ -30,5 +31,5 @@ def load_eeg(subject_id):
     print(f"✅ Loading EEG file: {eeg_file}")
     
     # بارگذاری داده
-    raw = mne.io.read_raw_eeglab(eeg_file, preload=True)
+    raw = mne.io.read_raw_eeglab(eeg_file, preload=preload)
     return raw
\ No newline at end of file
@@ -15,4 +15,59 @@ def compute_rmse(clean, denoised):
 def compute_corr(clean, denoised):
     # Calculate the Pearson correlation coefficient between clean and denoised signals
     # Flatten the arrays to 1D and extract the correlation value (off-diagonal element)
-    return np.corrcoef(clean.flatten(), denoised.flatten())[0, 1]
\ No newline at end of file
+    return np.corrcoef(clean.flatten(), denoised.flatten())[0, 1]
+
+# EEG bands plus the two artifact bands the noise model adds (Hz, [low, high))
+BANDS = {
+    "Drift": (0, 1),
+    "Delta": (1, 4),
+    "Theta": (4, 8),
+    "Alpha": (8, 13),
+    "Beta": (13, 30),
+    "Gamma": (30, 45),
+    "Line": (49, 51),
+}
+
+
+def compute_spectra(signals, sfreq, seg_sec=4):
+    """
+    Welch PSD of several signal sets in one batched pass
+    signals: dict name -> array (..., n_samples), e.g. (channels, samples) or
+             (epochs, channels, samples); all of the same shape
+    return: (freqs, dict name -> PSD of shape (..., n_freqs))
+    Compute this once and pass it to the band metrics so no FFT is repeated.
+    """
+    from scipy.signal import welch
+
+    names = list(signals)
+    # Stack every signal set so a single Welch call covers all of them
+    stacked = np.stack([signals[name] for name in names])
+    # Remove each channel's DC offset over the whole signal (the EEG is not
+    # high-passed), so the window's leakage from 0 Hz does not swamp the drift band
+    stacked = stacked - stacked.mean(axis=-1, keepdims=True)
+    nperseg = min(stacked.shape[-1], int(seg_sec * sfreq))
+    # No per-segment detrending, which would also remove part of the drift
+    # that spans a segment; only the DC bin itself is left out of the bands
+    freqs, psd = welch(stacked, fs=sfreq, nperseg=nperseg, detrend=False, axis=-1)
+    return freqs, dict(zip(names, psd))
+
+
+def compute_band_powers(freqs, psd, bands=BANDS):
+    """
+    Power in every band from a PSD, all bands at once
+    return: array (..., n_bands), band order as in bands
+    """
+    df = freqs[1] - freqs[0]
+    # Band membership matrix (n_freqs, n_bands), so one matmul integrates every band;
+    # the 0 Hz bin carries only the (removed) offset and belongs to no band
+    mask = np.stack([(freqs >= lo) & (freqs < hi) & (freqs > 0) for lo, hi in bands.values()], axis=-1)
+    return psd @ mask.astype(float) * df
+
+
+def compute_band_ratio(clean_power, test_power):
+    """
+    Band power of a signal relative to the clean reference in dB (0 dB = preserved),
+    from the total power over all channels/epochs per band
+    """
+    axes = tuple(range(clean_power.ndim - 1))
+    return 10 * np.log10(test_power.sum(axis=axes) / clean_power.sum(axis=axes))
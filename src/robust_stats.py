@@ -0,0 +1,54 @@
+import numpy as np
+
+
+# Elements per block in rigrsure_select: the squared and masked temporaries of
+# one block stay in cache (on large batches they would otherwise cost more
+# than the per-vector loop)
+SELECT_BLOCK_ELEMENTS = 2 ** 16
+
+
+def rigrsure_select(coeffs, axis=-1):
+    """
+    rigrsure's threshold without sorting.
+    With squared coefficients s sorted ascending, consecutive risks differ by
+    (s[k+1] - 2) / n, so the risk falls while s < 2 and rises afterwards. The
+    minimum is therefore at the largest squared coefficient below 2 (or at the
+    smallest one if none is below 2): one masked max/min pass, O(n) per vector.
+    Returns thresholds with a length-1 dimension on axis, like rigrsure(axis=...).
+    """
+    coeffs = np.moveaxis(np.asarray(coeffs), axis, -1)
+    out_shape = coeffs.shape[:-1] + (1,)
+    n = coeffs.shape[-1]
+    if n == 0:
+        return np.moveaxis(np.zeros(out_shape), -1, axis)
+
+    rows = coeffs.reshape(-1, n)
+    thresholds = np.empty((rows.shape[0], 1))
+    # A few vectors at a time, so the temporaries stay cache-sized
+    step = max(1, SELECT_BLOCK_ELEMENTS // n)
+    for start in range(0, rows.shape[0], step):
+        squares = rows[start:start + step] ** 2
+        # Largest squared coefficient on the falling side of the risk curve
+        below = np.max(np.where(squares < 2, squares, -np.inf), axis=-1, keepdims=True)
+        # If the curve never falls, the first (smallest) candidate has minimum risk
+        smallest = np.min(squares, axis=-1, keepdims=True)
+        thresholds[start:start + step] = np.sqrt(np.where(np.isfinite(below), below, smallest))
+    return np.moveaxis(thresholds.reshape(out_shape), -1, axis)
+
+
+def update_running_median(estimate, block, step):
+    """
+    Streaming median approximation of |coeffs| for the online path.
+    estimate: current per-channel median estimate, shape (n_channels,) (or None to start)
+    block: new non-negative data (e.g. |coeffs|), shape (n_channels, n_samples)
+    step: relative adaptation rate (0 < step < 1); the estimate is scaled by
+          (1 + step * sign balance of the block), so convergence does not
+          depend on the data's units and the estimate stays >= 0
+    O(n) per block and O(1) memory per channel after the first block.
+    """
+    if estimate is None:
+        # Seed with the first block's median; later blocks only need sign counts
+        return np.median(block, axis=-1)
+    # Fraction above minus fraction below the estimate is zero at the median
+    balance = np.mean(np.sign(block - estimate[:, None]), axis=-1)
+    return estimate * (1 + step * balance)
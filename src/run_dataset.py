@@ -0,0 +1,121 @@
+"""
+Full-Dataset EEG Denoising Run
+------------------------------
+Runs the baseline and adaptive evaluation of test_denoising.py for every
+subject through the memory-budget scheduler. Each subject's footprint is
+estimated from a dataset index (header-only read), so long recordings and
+many workers stay within the node's memory.
+"""
+
+import os
+import pandas as pd
+from scheduler import build_dataset_index, estimate_footprint, run_scheduled
+
+
+# ============================
+# Configuration
+# ============================
+subjects = [f"sub-{i:03d}" for i in range(1, 150)]
+wavelets = ["db4", "dmey"]
+snr_db = 10
+baseline_drift_ratio = 0.05
+
+memory_budget_gb = 8
+max_workers = os.cpu_count() or 1
+max_retries = 2
+index_file = "dataset_index.csv"
+results_file = "dataset_results.csv"
+job_log_file = "dataset_job_log.csv"
+
+
+def process_subject(subject, wavelets, snr_db, baseline_drift_ratio):
+    """Load, add noise, denoise and evaluate one subject (runs in a worker process)"""
+    from load_data import load_eeg
+    from preprocessing import basic_preprocessing
+    from segment import extract_segment
+    from add_noise import add_line_noise, add_baseline_wander
+    from baseline_denoise import baseline_wavelet_denoise
+    from adaptive_denoise import adaptive_wavelet_denoise
+    from evaluate_methods import evaluate
+
+    raw = basic_preprocessing(load_eeg(subject))
+    segment, sfreq = extract_segment(raw)
+    clean = segment * 1e6
+
+    noisy = add_line_noise(clean, sfreq, snr_db=snr_db)
+    noisy = add_baseline_wander(noisy, sfreq, amplitude_ratio=baseline_drift_ratio)
+
+    rows = []
+    for w in wavelets:
+        baseline = baseline_wavelet_denoise(noisy, wavelet=w)
+        adaptive = adaptive_wavelet_denoise(noisy, wavelet=w)
+        results = evaluate(clean, noisy, baseline, adaptive, sfreq=sfreq)
+        results["subject"] = subject
+        results["wavelet"] = w
+        results["group"] = "healthy" if int(subject.split("-")[1]) > 100 else "parkinson"
+        rows.append(results)
+    return rows
+
+
+if __name__ == "__main__":
+    # ----------------------------
+    # Dataset index (header-only read, cached on disk)
+    # ----------------------------
+    # Subjects whose header cannot be read are left out of the schedule and
+    # logged as failed; they are not cached, so the next run tries them again
+    if os.path.exists(index_file):
+        index = pd.read_csv(index_file)
+        missing = sorted(set(subjects) - set(index["subject"]))
+        index_failures = {}
+        if missing:
+            new_rows, index_failures = build_dataset_index(missing)
+            index = pd.concat([index, new_rows], ignore_index=True)
+            index.to_csv(index_file, index=False)
+    else:
+        index, index_failures = build_dataset_index(subjects, index_file)
+    index = index[index["subject"].isin(subjects)]
+
+    footprints = estimate_footprint(index)
+    jobs = [(subject, footprint, (subject, wavelets, snr_db, baseline_drift_ratio))
+            for subject, footprint in zip(index["subject"], footprints)]
+
+    print("=" * 70)
+    print(f"Scheduling {len(jobs)} subjects, budget {memory_budget_gb} GB, "
+          f"up to {max_workers} workers")
+    if index_failures:
+        print(f"Skipped {len(index_failures)} subjects whose header could not be read")
+    if jobs:
+        print(f"Largest expected footprint: {footprints.max() / 1024 ** 3:.2f} GB")
+    print("=" * 70)
+
+    # ----------------------------
+    # Run
+    # ----------------------------
+    results, job_log = run_scheduled(jobs, process_subject,
+                                     memory_budget=memory_budget_gb * 1024 ** 3,
+                                     max_workers=max_workers, max_retries=max_retries)
+
+    # Index failures go into the same job log, with no attempts
+    index_log = pd.DataFrame([{"job_id": subject, "status": "failed", "attempts": 0, "retries": 0,
+                               "failure_reasons": f"dataset index: {reason}"}
+                              for subject, reason in index_failures.items()])
+    job_log = pd.concat([job_log, index_log], ignore_index=True)
+
+    # ----------------------------
+    # Save Results
+    # ----------------------------
+    job_log.to_csv(job_log_file, index=False)
+    print(f"\n📁 Job log saved to: {job_log_file}")
+
+    failed = job_log[job_log.status != "ok"]
+    print(f"✅ Successfully processed: {len(results)}/{len(subjects)}")
+    print(f"❌ Failed: {len(failed)}")
+    for _, row in failed.iterrows():
+        print(f"  {row.job_id}: {row.failure_reasons}")
+    print(f"Max peak RSS: {job_log.peak_rss_mb.max():.0f} MB, "
+          f"total retries: {int(job_log.retries.sum())}")
+
+    if results:
+        df = pd.DataFrame([row for rows in results.values() for row in rows])
+        df.to_csv(results_file, index=False)
+        print(f"📁 Results saved to: {results_file}")
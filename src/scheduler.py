@@ -0,0 +1,210 @@
+"""
+Memory-budget job scheduler for full-dataset runs.
+
+Every job runs in its own worker process. Jobs are admitted largest first,
+and only while the sum of the expected footprints of the running jobs stays
+within the configured memory budget. For each job the scheduler records peak
+RSS, retries and failure reasons.
+"""
+
+import multiprocessing as mp
+import resource
+import time
+import traceback
+
+import numpy as np
+import pandas as pd
+
+
+# Memory held per job relative to the raw recording: the preloaded data,
+# the full-array copy made by raw.get_data(), and the wavelet coefficient /
+# thresholding copies made while denoising
+COPY_FACTOR = 3.0
+# Resident memory of a worker before it loads any data (Python, NumPy, MNE)
+WORKER_OVERHEAD_BYTES = 250 * 1024 ** 2
+# Footprint multiplier applied before retrying a job whose worker was killed
+RETRY_GROWTH = 1.5
+
+
+def build_dataset_index(subjects, output_file=None):
+    """
+    Read only the header of every recording and tabulate its size
+    return: (index, failures) where index is a DataFrame with subject,
+            n_channels, n_times, sfreq, itemsize, and failures maps each subject
+            whose header could not be read (e.g. missing directory) to the reason
+    """
+    from load_data import load_eeg
+
+    rows = []
+    failures = {}
+    for subject in subjects:
+        try:
+            raw = load_eeg(subject, preload=False)
+            raw.pick(picks="eeg")
+        except Exception as e:
+            # One unreadable recording must not stop the whole dataset run
+            failures[subject] = f"{type(e).__name__}: {e}"
+            continue
+        rows.append({
+            "subject": subject,
+            "n_channels": len(raw.ch_names),
+            "n_times": raw.n_times,
+            "sfreq": raw.info["sfreq"],
+            # MNE loads data as float64
+            "itemsize": np.dtype(np.float64).itemsize,
+        })
+    index = pd.DataFrame(rows, columns=["subject", "n_channels", "n_times", "sfreq", "itemsize"])
+    if output_file is not None:
+        index.to_csv(output_file, index=False)
+    return index, failures
+
+
+def estimate_footprint(index, copy_factor=COPY_FACTOR, worker_overhead=WORKER_OVERHEAD_BYTES):
+    """
+    Expected peak memory (bytes) per row of a dataset index:
+    n_channels x n_times x itemsize x copy_factor + worker overhead
+    """
+    data_bytes = index["n_channels"] * index["n_times"] * index["itemsize"]
+    return data_bytes * copy_factor + worker_overhead
+
+
+def _peak_rss_bytes():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _worker_context():
+    """
+    Start method for workers: forkserver (spawn where it is unavailable), so
+    each worker starts from a clean interpreter instead of a fork of the
+    driver, and its peak RSS counts only the job, not the driver's pages
+    """
+    method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+    return mp.get_context(method)
+
+
+def _run_job(conn, func, args):
+    """Worker entry point: run func(*args) and send back the outcome and peak RSS"""
+    try:
+        result = func(*args)
+        conn.send(("ok", result, None, _peak_rss_bytes()))
+    except MemoryError as e:
+        conn.send(("retry", None, f"MemoryError: {e}", _peak_rss_bytes()))
+    except Exception as e:
+        reason = f"{type(e).__name__}: {e}"
+        conn.send(("error", None, reason, _peak_rss_bytes()))
+        traceback.print_exc()
+    finally:
+        conn.close()
+
+
+def _read_outcome(conn):
+    """Outcome a worker sent through conn, or None if it exited without sending one"""
+    if not conn.poll():
+        return None
+    try:
+        return conn.recv()
+    except EOFError:
+        return None
+
+
+def run_scheduled(jobs, func, memory_budget, max_workers, max_retries=2, poll_interval=0.1):
+    """
+    Run func(*args) for every job under a memory budget.
+    jobs: list of (job_id, footprint_bytes, args)
+    memory_budget: bytes the running jobs' footprints may add up to
+    max_workers: maximum number of worker processes at a time
+    max_retries: extra attempts for jobs that ran out of memory or whose worker
+                 died (e.g. OOM-killed); their footprint estimate grows by
+                 RETRY_GROWTH per retry. Ordinary exceptions are not retried.
+    A job larger than the whole budget is run on its own once nothing else is running.
+    func must be importable by module name (workers are not forked from the caller).
+    return: (results, log) where results maps job_id -> func's return value for
+            successful jobs and log is a DataFrame with one row per job
+    """
+    ctx = _worker_context()
+    # Largest first, so big recordings are not left waiting for a gap at the end
+    pending = sorted(({"job_id": job_id, "footprint": footprint, "args": args, "attempts": 0,
+                       "reasons": []} for job_id, footprint, args in jobs),
+                     key=lambda job: job["footprint"], reverse=True)
+    running = []
+    results = {}
+    log = []
+
+    def finish(job, status, peak_rss):
+        log.append({
+            "job_id": job["job_id"],
+            "status": status,
+            "attempts": job["attempts"],
+            "retries": job["attempts"] - 1,
+            "footprint_mb": job["footprint"] / 1024 ** 2,
+            "peak_rss_mb": peak_rss / 1024 ** 2 if peak_rss is not None else np.nan,
+            "elapsed_sec": time.perf_counter() - job["start"],
+            "failure_reasons": "; ".join(job["reasons"]),
+        })
+
+    while pending or running:
+        # Admit jobs, largest first, while they fit the remaining budget
+        in_use = sum(job["footprint"] for job in running)
+        for job in list(pending):
+            if len(running) >= max_workers:
+                break
+            fits = in_use + job["footprint"] <= memory_budget
+            # An oversized job may only run alone
+            if fits or not running:
+                pending.remove(job)
+                recv_conn, send_conn = ctx.Pipe(duplex=False)
+                job["process"] = ctx.Process(target=_run_job, args=(send_conn, func, job["args"]))
+                job["conn"] = recv_conn
+                job["attempts"] += 1
+                job["start"] = time.perf_counter()
+                job["process"].start()
+                send_conn.close()
+                running.append(job)
+                in_use += job["footprint"]
+                if not fits:
+                    break
+
+        time.sleep(poll_interval)
+
+        # Collect finished jobs
+        for job in list(running):
+            process, conn = job["process"], job["conn"]
+            if conn.poll():
+                # Read before joining, so a worker blocked on sending a large result can finish
+                outcome = _read_outcome(conn)
+                process.join()
+            elif process.is_alive():
+                continue
+            else:
+                process.join()
+                # The worker may have sent its outcome and exited between the
+                # poll above and the liveness check; read it before treating
+                # the worker as killed
+                outcome = _read_outcome(conn)
+
+            running.remove(job)
+            conn.close()
+            if outcome is None:
+                # The worker exited without reporting back (killed by a signal, e.g. the OOM killer)
+                status, result, reason, peak_rss = "retry", None, f"worker exited with code {process.exitcode}", None
+            else:
+                status, result, reason, peak_rss = outcome
+
+            if status == "ok":
+                results[job["job_id"]] = result
+                finish(job, "ok", peak_rss)
+                continue
+
+            job["reasons"].append(reason)
+            if status == "retry" and job["attempts"] <= max_retries:
+                # Give the retry more headroom and put it back in largest-first order
+                job["footprint"] *= RETRY_GROWTH
+                pending.append(job)
+                pending.sort(key=lambda j: j["footprint"], reverse=True)
+            else:
+                finish(job, "failed", peak_rss)
+
+    return results, pd.DataFrame(log, columns=["job_id", "status", "attempts", "retries",
+                                                "footprint_mb", "peak_rss_mb", "elapsed_sec",
+                                                "failure_reasons"])
@@ -11,7 +11,8 @@ from preprocessing import basic_preprocessing
 from segment import extract_segment
 from add_noise import add_line_noise, add_baseline_wander
 from baseline_denoise import baseline_wavelet_denoise
-from adaptive_denoise import adaptive_wavelet_denoise
+from adaptive_denoise import adaptive_wavelet_denoise, spatial_adaptive_wavelet_denoise
+from channel_neighbors import montage_positions, build_neighbor_index
 from evaluate_methods import evaluate
 import pandas as pd
 import os
@@ -31,6 +32,9 @@ subjects = healthy_subjects  # برای اجرا روی همه ۴۹ نفر
 wavelets = ["db4", "dmey"]
 snr_db = 10
 baseline_drift_ratio = 0.05
+n_jobs = 1  # threads per recording for the wavelet/threshold stages (-1 = all cores)
+spatial = False  # also evaluate the spatial adaptive method (thresholds pooled over montage neighbours)
+n_neighbors = 6
 
 
 # ============================
@@ -62,6 +66,10 @@ for idx, subject in enumerate(subjects):
         # Convert to microvolts (ground truth reference)
         clean = segment * 1e6
 
+        # Neighbour index from the montage set in basic_preprocessing (once per recording)
+        if spatial:
+            neighbors = build_neighbor_index(montage_positions(raw), n_neighbors)
+
         # ----------------------------
         # Add Controlled Artificial Noise
         # ----------------------------
@@ -76,15 +84,18 @@ for idx, subject in enumerate(subjects):
             print(f"  Wavelet: {w}")
 
             # Baseline method (Rigrsure + Hard threshold)
-            baseline = baseline_wavelet_denoise(noisy, wavelet=w)
+            baseline = baseline_wavelet_denoise(noisy, wavelet=w, n_jobs=n_jobs)
 
             # Proposed adaptive method
-            adaptive = adaptive_wavelet_denoise(noisy, wavelet=w)
+            adaptive = adaptive_wavelet_denoise(noisy, wavelet=w, n_jobs=n_jobs)
+
+            # Spatial adaptive method (optional)
+            spatial_result = spatial_adaptive_wavelet_denoise(noisy, neighbors, wavelet=w) if spatial else None
 
             # ----------------------------
             # Quantitative Evaluation
             # ----------------------------
-            results = evaluate(clean, noisy, baseline, adaptive)
+            results = evaluate(clean, noisy, baseline, adaptive, sfreq=sfreq, spatial=spatial_result)
 
             # Add metadata
             results['subject'] = subject
@@ -94,6 +105,8 @@ for idx, subject in enumerate(subjects):
 
             print(f"    SNR_baseline={results['Baseline SNR']:.3f}, "
                   f"SNR_adaptive={results['Adaptive SNR']:.3f}")
+            if spatial:
+                print(f"    SNR_spatial={results['Spatial SNR']:.3f}")
 
         successful += 1
 
@@ -145,6 +158,12 @@ if all_results:
         print()
         print(f"  CORR - Baseline: {baseline_corr:.3f} ± {subset['Baseline Corr'].std():.3f}")
         print(f"  CORR - Adaptive: {adaptive_corr:.3f} ± {subset['Adaptive Corr'].std():.3f}")
+
+        if spatial:
+            print()
+            print(f"  SNR - Spatial: {subset['Spatial SNR'].mean():.3f} ± {subset['Spatial SNR'].std():.3f}")
+            print(f"  RMSE - Spatial: {subset['Spatial RMSE'].mean():.3f} ± {subset['Spatial RMSE'].std():.3f}")
+            print(f"  CORR - Spatial: {subset['Spatial Corr'].mean():.3f} ± {subset['Spatial Corr'].std():.3f}")
     
     print("\n" + "=" * 60)
     print("✅ Processing complete!")
@@ -0,0 +1,174 @@
+"""
+Fit-once / apply-many adaptive threshold model.
+
+fit_threshold_model estimates per-channel, per-level thresholds from a
+reference cohort (or a calibration window) with the adaptive rule and keeps
+them in a small model; apply_threshold_model then denoises new data with the
+stored values only (transform + mask + inverse, no median or sort work).
+"""
+
+import numpy as np
+from adaptive_threshold import adaptive_threshold
+from threshold_rules import hard_threshold
+from wavelet_utils import batched_wavedec, batched_waverec
+
+
+def _noise_scale(finest_detail):
+    """
+    Cheap per-channel noise scale from the finest detail level.
+    Uses the mean absolute value (O(n), no median); sqrt(pi/2) makes it
+    match the standard deviation for Gaussian noise.
+    """
+    return np.mean(np.abs(finest_detail), axis=-1) * np.sqrt(np.pi / 2)
+
+
+def _check_ch_names(expected, ch_names, what):
+    """Raise if ch_names is not exactly expected (same names, same order)"""
+    if list(ch_names) != list(expected):
+        mismatch = next((i for i, (a, b) in enumerate(zip(expected, ch_names)) if a != b),
+                        min(len(expected), len(ch_names)))
+        raise ValueError(f"{what} channel names differ at position {mismatch} "
+                         f"({len(ch_names)} vs {len(expected)} channels)")
+
+
+def fit_threshold_model(signals, wavelet="db4", level=5, ch_names=None):
+    """
+    signals: one array of shape (n_channels, n_samples) or a list of them
+             (e.g. one segment per cohort subject, all with the same channels)
+    ch_names: channel names of the signals, either one list shared by all of
+              them or one list per signal; per-signal lists must all have the
+              same names in the same order
+    return: model dict with thresholds of shape (n_channels, level)
+    """
+    if isinstance(signals, np.ndarray) and signals.ndim == 2:
+        signals = [signals]
+
+    if ch_names is not None and len(ch_names) and not isinstance(ch_names[0], str):
+        # One list per signal: thresholds are aggregated by row, so every
+        # signal must list its channels in the same order
+        if len(ch_names) != len(signals):
+            raise ValueError(f"Got {len(ch_names)} channel name lists for {len(signals)} signals")
+        for i, names in enumerate(ch_names[1:], start=1):
+            _check_ch_names(ch_names[0], names, f"Reference signal {i} and signal 0")
+        ch_names = ch_names[0]
+
+    thresholds = []
+    noise_scales = []
+    for signal in signals:
+        # One batched decomposition for all channels of this recording
+        coeffs = batched_wavedec(signal, wavelet, level)
+        # Channel energy, kept as a column so the rule gives one threshold per channel
+        channel_energy = np.mean(signal ** 2, axis=-1, keepdims=True)
+        # Same adaptive rule as adaptive_wavelet_denoise, evaluated per channel
+        thresholds.append(np.hstack([
+            adaptive_threshold(coeffs[lvl], channel_energy, lvl, axis=-1)
+            for lvl in range(1, len(coeffs))
+        ]))
+        noise_scales.append(_noise_scale(coeffs[-1]))
+
+    n_channels = {t.shape[0] for t in thresholds}
+    if len(n_channels) != 1:
+        raise ValueError(f"All reference signals must have the same channels, got {sorted(n_channels)}")
+    if ch_names is not None and len(ch_names) != thresholds[0].shape[0]:
+        raise ValueError(f"Got {len(ch_names)} channel names for {thresholds[0].shape[0]} channels")
+
+    # Robust aggregation across the reference recordings
+    model = {
+        "wavelet": wavelet,
+        "level": level,
+        "thresholds": np.median(thresholds, axis=0),
+        "noise_scale": np.median(noise_scales, axis=0),
+        "ch_names": np.asarray(ch_names if ch_names is not None else [], dtype=str),
+    }
+    return model
+
+
+def save_threshold_model(model, path):
+    """
+    Save a fitted model as a compressed .npz file
+    """
+    np.savez_compressed(path, **model)
+
+
+def load_threshold_model(path):
+    """
+    Load a model written by save_threshold_model
+    """
+    with np.load(path) as data:
+        return {
+            "wavelet": str(data["wavelet"]),
+            "level": int(data["level"]),
+            "thresholds": data["thresholds"],
+            "noise_scale": data["noise_scale"],
+            "ch_names": data["ch_names"],
+        }
+
+
+def detect_drift(coeffs, model, tolerance=1.5):
+    """
+    Compare the live noise level with the fitted one
+    coeffs: batched wavedec output of the live signal (channels on axis 0)
+    tolerance: flag channels whose noise scale moved by more than this factor either way
+    return: dict with per-channel "ratio" (live / fitted) and boolean "drifted"
+    """
+    ratio = _noise_scale(coeffs[-1]) / model["noise_scale"]
+    drifted = (ratio > tolerance) | (ratio < 1 / tolerance)
+    return {"ratio": ratio, "drifted": drifted}
+
+
+def apply_threshold_model(signal, model, return_drift=False, tolerance=1.5, ch_names=None):
+    """
+    Denoise signal (n_channels, n_samples) with the stored thresholds
+    return_drift: also return the detect_drift report for this signal
+    ch_names: the signal's channel names; when given (and the model stores
+              names) they must match the model's names and order
+    """
+    thresholds = model["thresholds"]
+    if signal.shape[0] != thresholds.shape[0]:
+        raise ValueError(f"Model was fitted on {thresholds.shape[0]} channels, "
+                         f"signal has {signal.shape[0]}")
+    if ch_names is not None and len(model["ch_names"]):
+        _check_ch_names(model["ch_names"], ch_names, "Signal and model")
+
+    wavelet = model["wavelet"]
+    # Decompose all channels in one call
+    coeffs = batched_wavedec(signal, wavelet, model["level"])
+
+    if return_drift:
+        # Noise level is measured on the raw coefficients, as at fit time
+        drift = detect_drift(coeffs, model, tolerance)
+
+    # Mask every detail level with the stored per-channel thresholds
+    for lvl in range(1, len(coeffs)):
+        coeffs[lvl] = hard_threshold(coeffs[lvl], thresholds[:, lvl - 1:lvl])
+
+    # Reconstruct all channels in one call
+    denoised = batched_waverec(coeffs, wavelet)
+
+    if return_drift:
+        return denoised, drift
+    return denoised
+
+
+if __name__ == "__main__":
+    from load_data import load_eeg
+    from preprocessing import basic_preprocessing
+    from segment import extract_segment
+
+    # Fit on the healthy cohort and save the model for later runs
+    subjects = [f"sub-{i:03d}" for i in range(101, 150)]
+    wavelet = "db4"
+
+    segments = []
+    ch_names = []
+    for subject in subjects:
+        raw = basic_preprocessing(load_eeg(subject))
+        segment, sfreq = extract_segment(raw)
+        segments.append(segment * 1e6)
+        # One list per subject, so fitting checks that every segment has the same order
+        ch_names.append(raw.ch_names)
+
+    model = fit_threshold_model(segments, wavelet=wavelet, ch_names=ch_names)
+    output_file = f"threshold_model_{wavelet}.npz"
+    save_threshold_model(model, output_file)
+    print(f"Saved: {output_file}")
@@ -1,28 +1,48 @@
 import numpy as np
+from robust_stats import rigrsure_select
 
 
-def rigrsure(coeffs):
+def rigrsure(coeffs, axis=None, method="sort"):
     """
-    coeffs: 1D numpy array (detail coefficients)
+    coeffs: numpy array (detail coefficients)
+    axis: None treats coeffs as one 1D vector and returns a scalar threshold;
+          an integer computes one threshold per vector along that axis
+          (kept as a length-1 dimension so it broadcasts back onto coeffs)
+    method: "sort" searches the risk over a full sort; "select" finds the
+          same minimum with one O(n) selection pass (see rigrsure_select)
     Compute threshold using Stein's Unbiased Risk Estimate (SURE) method
     """
     # Convert input to numpy array if it isn't already
     coeffs = np.asarray(coeffs)
-    # Get the number of coefficients
-    n = coeffs.size
+    # A single vector is handled as the batched case with one row
+    if axis is None:
+        return rigrsure(coeffs.ravel(), axis=-1, method=method)[0]
+    # Selection-based search instead of a full sort
+    if method == "select":
+        return rigrsure_select(coeffs, axis=axis)
+    if method != "sort":
+        raise ValueError(f"Unknown SURE method: {method}")
+    # Get the number of coefficients in each vector
+    n = coeffs.shape[axis]
     # Return zero threshold if the array is empty
     if n == 0:
-        return 0
+        out_shape = list(coeffs.shape)
+        out_shape[axis] = 1
+        return np.zeros(out_shape)
 
     # Sort the squared coefficients in ascending order
-    sorted_coeffs = np.sort(coeffs ** 2)
+    sorted_coeffs = np.sort(coeffs ** 2, axis=axis)
+    # Shape the 1..n ramp so it lines up with the reduction axis
+    ramp_shape = [1] * coeffs.ndim
+    ramp_shape[axis] = n
+    ramp = np.arange(1, n+1).reshape(ramp_shape)
     # Calculate the risk for each potential threshold
     # Formula: (n - 2 * (1..n) + cumulative sum of sorted squared coefficients) / n
-    risks = (n - 2 * np.arange(1, n+1) + np.cumsum(sorted_coeffs)) / n
+    risks = (n - 2 * ramp + np.cumsum(sorted_coeffs, axis=axis)) / n
     # Find the index of the minimum risk
-    idx = np.argmin(risks)
+    idx = np.expand_dims(np.argmin(risks, axis=axis), axis)
     # The threshold is the square root of the coefficient at that index
-    threshold = np.sqrt(sorted_coeffs[idx])
+    threshold = np.sqrt(np.take_along_axis(sorted_coeffs, idx, axis=axis))
     return threshold
 
 
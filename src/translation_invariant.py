@@ -0,0 +1,69 @@
+import numpy as np
+from adaptive_threshold import adaptive_threshold
+from threshold_rules import rigrsure, hard_threshold
+from wavelet_utils import batched_wavedec, batched_waverec
+
+
+def shift_stack(signal, n_shifts):
+    """
+    signal: shape (n_channels, n_samples)
+    return: shape (n_shifts, n_channels, n_samples), copy k circularly shifted by k samples
+    """
+    n_samples = signal.shape[-1]
+    # Index table: row k reads the signal starting k samples earlier
+    idx = (np.arange(n_samples)[None, :] - np.arange(n_shifts)[:, None]) % n_samples
+    # Fancy indexing builds every shifted copy in a single gather
+    return np.moveaxis(signal[:, idx], 1, 0)
+
+
+def unshift_mean(shifted, n_samples):
+    """
+    Undo the shifts applied by shift_stack and average the copies
+    shifted: shape (n_shifts, n_channels, >= n_samples)
+    """
+    n_shifts = shifted.shape[0]
+    # Trim the extra sample waverec can add for odd lengths
+    shifted = shifted[..., :n_samples]
+    # Row k is read back k samples later to undo its shift
+    idx = (np.arange(n_samples)[None, :] + np.arange(n_shifts)[:, None]) % n_samples
+    aligned = np.take_along_axis(shifted, idx[:, None, :], axis=-1)
+    return aligned.mean(axis=0)
+
+
+def ti_wavelet_denoise(signal, wavelet="db4", level=5, n_shifts=8, rule="adaptive",
+                       sure_method="sort", method="auto"):
+    """
+    Translation-invariant (cycle-spinning) wavelet denoising.
+    All n_shifts circularly shifted copies of the signal are stacked and pushed
+    through one batched decomposition, threshold and reconstruction, then
+    shifted back and averaged.
+    rule: "adaptive" (adaptive_threshold) or "sure" (rigrsure), both with hard thresholding
+    sure_method: estimator option passed to rigrsure
+    method: filter bank used for the transforms ("direct", "fft" or "auto")
+    """
+    if rule not in ("adaptive", "sure"):
+        raise ValueError(f"Unknown threshold rule: {rule}")
+
+    signal = np.asarray(signal)
+    n_samples = signal.shape[-1]
+    # Build the (n_shifts, n_channels, n_samples) batch of shifted copies
+    shifted = shift_stack(signal, n_shifts)
+
+    # One decomposition for every shift and channel at once
+    coeffs = batched_wavedec(shifted, wavelet, level, method=method)
+
+    if rule == "adaptive":
+        # Channel energy per shifted copy (a circular shift leaves it unchanged)
+        channel_energy = np.mean(shifted ** 2, axis=-1, keepdims=True)
+
+    # Threshold every detail level for all shifts and channels in one pass
+    for lvl in range(1, len(coeffs)):
+        if rule == "adaptive":
+            T = adaptive_threshold(coeffs[lvl], channel_energy, lvl, axis=-1)
+        else:
+            T = rigrsure(coeffs[lvl], axis=-1, method=sure_method)
+        coeffs[lvl] = hard_threshold(coeffs[lvl], T)
+
+    # One inverse transform for the whole batch, then align and average the copies
+    reconstructed = batched_waverec(coeffs, wavelet, method=method)
+    return unshift_mean(reconstructed, n_samples)
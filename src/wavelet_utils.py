@@ -1,35 +1,103 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pywt
 import numpy as np
+from fft_filter_bank import use_fft, fft_wavedec, fft_waverec
+
+
+def resolve_n_jobs(n_jobs):
+    """
+    Convert an n_jobs setting into a worker count (None or 1 -> serial, -1 -> all cores)
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        # Negative values count back from the number of available cores
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, int(n_jobs))
+
+
+def map_channels(func, items, n_jobs=1):
+    """
+    Apply func to every item (one per channel) and return the results in order.
+    With n_jobs > 1 the channels are split into contiguous blocks that run on a
+    thread pool; NumPy and PyWavelets release the GIL inside their kernels.
+    """
+    items = list(items)
+    n_workers = min(resolve_n_jobs(n_jobs), len(items))
+    # Serial path: nothing to gain from a pool
+    if n_workers <= 1:
+        return [func(item) for item in items]
+
+    # One contiguous block of channels per worker keeps the scheduling overhead low
+    bounds = np.linspace(0, len(items), n_workers + 1).astype(int)
+    blocks = [items[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def run_block(block):
+        return [func(item) for item in block]
 
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        # executor.map preserves block order, so the output order matches the input
+        results = []
+        for block_result in executor.map(run_block, blocks):
+            results.extend(block_result)
+    return results
 
-def wavelet_decompose(signal, wavelet="db4", level=5):
+
+def batched_wavedec(signal, wavelet="db4", level=5, method="auto", n_jobs=1):
+    """
+    Decompose all rows of signal (..., n_samples) at once along the last axis
+    return: [cAn, cDn, ..., cD1], each array batched over the leading axes
+    method: "direct" (pywt), "fft" (FFT filter bank) or "auto" (by filter length and size)
+    """
+    if use_fft(wavelet, signal.shape[-1], method):
+        return fft_wavedec(signal, wavelet, level, workers=resolve_n_jobs(n_jobs))
+    return pywt.wavedec(signal, wavelet, level=level, axis=-1)
+
+
+def batched_waverec(coeffs, wavelet="db4", method="auto", n_jobs=1):
+    """
+    Inverse of batched_wavedec
+    """
+    # Output length is about twice the finest detail length
+    if use_fft(wavelet, 2 * coeffs[-1].shape[-1], method, inverse=True):
+        return fft_waverec(coeffs, wavelet, workers=resolve_n_jobs(n_jobs))
+    return pywt.waverec(coeffs, wavelet, axis=-1)
+
+
+def wavelet_decompose(signal, wavelet="db4", level=5, n_jobs=1, method="auto"):
     """
     signal: shape (n_channels, n_samples)
     return: list of coeffs per channel
     Perform wavelet decomposition on each channel of the input signal
+    n_jobs: number of threads used to process channels (1 = serial)
+    method: "direct", "fft" or "auto"; long filters such as dmey use the
+            batched FFT filter bank on all channels at once
     """
-    # Initialize an empty list to store coefficients for all channels
-    coeffs_all = []
-    # Iterate over each channel in the signal
-    for ch in signal:
-        # Perform wavelet decomposition on the current channel
-        coeffs = pywt.wavedec(ch, wavelet, level=level)
-        # Append the coefficients to the list
-        coeffs_all.append(coeffs)
-    return coeffs_all
+    if use_fft(wavelet, signal.shape[-1], method):
+        # One batched decomposition, then split into the per-channel layout
+        coeffs = batched_wavedec(signal, wavelet, level, method="fft", n_jobs=n_jobs)
+        return [[c[ch] for c in coeffs] for ch in range(signal.shape[0])]
 
+    # Decompose every channel; the per-channel call is identical in serial and threaded mode
+    return map_channels(lambda ch: pywt.wavedec(ch, wavelet, level=level),
+                        signal, n_jobs)
 
-def wavelet_reconstruct(coeffs_all, wavelet="db4"):
+
+def wavelet_reconstruct(coeffs_all, wavelet="db4", n_jobs=1, method="auto"):
     """
     Reconstruct the signal from wavelet coefficients for all channels
+    n_jobs: number of threads used to process channels (1 = serial)
+    method: "direct", "fft" or "auto" (see wavelet_decompose)
     """
-    # Initialize an empty list to store reconstructed channels
-    reconstructed = []
-    # Iterate over the coefficients for each channel
-    for coeffs in coeffs_all:
-        # Perform wavelet reconstruction for the current channel
-        rec = pywt.waverec(coeffs, wavelet)
-        # Append the reconstructed channel to the list
-        reconstructed.append(rec)
+    if use_fft(wavelet, 2 * len(coeffs_all[0][-1]), method, inverse=True):
+        # Stack each level across channels and reconstruct them in one batch
+        coeffs = [np.array([c[lvl] for c in coeffs_all]) for lvl in range(len(coeffs_all[0]))]
+        return batched_waverec(coeffs, wavelet, method="fft", n_jobs=n_jobs)
+
+    # Reconstruct every channel from its coefficients
+    reconstructed = map_channels(lambda coeffs: pywt.waverec(coeffs, wavelet),
+                                 coeffs_all, n_jobs)
     # Convert the list of reconstructed channels to a numpy array
-    return np.array(reconstructed)
\ No newline at end of file
+    return np.array(reconstructed)